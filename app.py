@@ -6,6 +6,8 @@ import textwrap
 import streamlit as st
 from openai import OpenAI
 
+from llm_transport import build_http_client, get_mode
+
 # ---------- CONFIG ----------
 
 st.set_page_config(
@@ -25,7 +27,23 @@ st.write(
 # st.write("DEBUG PARAMS:", st.query_params)
 
 # OpenAI client (expects OPENAI_API_KEY as environment variable or Streamlit secret)
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# SHWIFT_LLM_MODE=record / replay swaps in the fixture transport (see llm_transport.py).
+# Replay never touches the network, so it doesn't need a real key.
+# Cached so the transport (and its replay position) survives Streamlit reruns.
+@st.cache_resource
+def get_client(mode: str) -> OpenAI:
+    return OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY") or ("replay" if mode == "replay" else None),
+        http_client=build_http_client(mode),
+    )
+
+
+try:
+    LLM_MODE = get_mode()
+    client = get_client(LLM_MODE)
+except ValueError as e:
+    st.error(f"LLM transport is misconfigured: {e}")
+    st.stop()
 
 
 # ---------- HELPERS ----------
@@ -609,7 +627,7 @@ with st.form("diagnostic_form"):
 # ---------- HANDLE SUBMISSION ----------
 
 if submitted:
-    if not os.getenv("OPENAI_API_KEY"):
+    if not os.getenv("OPENAI_API_KEY") and LLM_MODE != "replay":
         st.error(
             "OPENAI_API_KEY not found. Please set it as an environment variable "
             "or in Streamlit secrets before running this app."
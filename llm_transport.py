@@ -0,0 +1,276 @@
+"""
+Record / replay transport for the OpenAI client.
+
+Sits under the OpenAI client as an httpx transport, so everything above it
+(`client.responses.create`, response parsing in `call_llm`) runs unchanged.
+
+Modes (set with SHWIFT_LLM_MODE):
+- "live"   : default, talks to OpenAI directly.
+- "record" : talks to OpenAI and saves every request/response pair, including
+             when each chunk of the body arrived, as a JSON fixture.
+- "replay" : no network. Serves responses from the fixtures, replaying the
+             recorded timing divided by SHWIFT_LLM_REPLAY_SPEED (e.g. 10 = 10x).
+
+Fixtures live in SHWIFT_LLM_FIXTURES (default: "llm_fixtures").
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+import warnings
+from pathlib import Path
+
+import httpx
+
+
+MODES = ("live", "record", "replay")
+
+# Only these response headers are kept; the rest are per-request noise.
+KEPT_HEADERS = ("content-type", "content-encoding")
+
+
+def request_key(request: httpx.Request) -> str:
+    # Identify a request by method, path and (canonical) JSON body.
+    body = request.read()
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except ValueError:
+        pass
+    digest = hashlib.sha256()
+    digest.update(request.method.encode("utf-8") + b" " + request.url.path.encode("utf-8") + b"\n")
+    digest.update(body)
+    return digest.hexdigest()[:16]
+
+
+def request_family(body) -> str:
+    """
+    Group requests that come from the same kind of prompt: the model plus the
+    first line of each input message. For call_llm that is the tier's
+    "You are SHWIFT — ..." opening, so loose replay stays within a tier.
+    """
+    if not isinstance(body, dict):
+        return ""
+    parts = [str(body.get("model", ""))]
+    messages = body.get("input")
+    if isinstance(messages, list):
+        for message in messages:
+            if isinstance(message, dict) and isinstance(message.get("content"), str):
+                content = message["content"].strip()
+                first_line = content.splitlines()[0] if content else ""
+                parts.append(f"{message.get('role', '')}:{first_line}")
+    return "\n".join(parts)
+
+
+class _RecordingStream(httpx.SyncByteStream):
+    """Pass the upstream body through, noting when each chunk arrived."""
+
+    def __init__(self, upstream, started: float, on_done):
+        self._upstream = upstream
+        self._started = started
+        self._on_done = on_done
+        self._body = bytearray()
+        self._chunks = []
+
+    def __iter__(self):
+        for chunk in self._upstream:
+            self._body.extend(chunk)
+            self._chunks.append([round(time.perf_counter() - self._started, 4), len(self._body)])
+            yield chunk
+        self._on_done(bytes(self._body), self._chunks)
+
+    def close(self):
+        self._upstream.close()
+
+
+class _ReplayStream(httpx.SyncByteStream):
+    """Yield the recorded body in its original chunks, at scaled timing."""
+
+    def __init__(self, body: bytes, chunks: list, started: float, speed: float):
+        self._body = body
+        self._chunks = chunks
+        self._started = started
+        self._speed = speed
+
+    def __iter__(self):
+        start = 0
+        for offset, end in self._chunks:
+            delay = self._started + offset / self._speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            yield self._body[start:end]
+            start = end
+
+
+class RecordReplayTransport(httpx.BaseTransport):
+    def __init__(self, mode: str, fixtures_dir, speed: float = 1.0, strict: bool = True, upstream=None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"mode must be 'record' or 'replay', got {mode!r}")
+        if speed <= 0:
+            raise ValueError(f"speed must be positive, got {speed!r}")
+        self.mode = mode
+        self.fixtures_dir = Path(fixtures_dir)
+        self.speed = speed
+        # strict=False lets replay fall back to any fixture for the same
+        # endpoint and request family (cycled in order), so different
+        # answers can reuse traffic.
+        self.strict = strict
+        self._upstream = upstream
+        self._fallback_index = {}
+        self._lock = threading.Lock()
+        if mode == "record":
+            self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+            if self._upstream is None:
+                self._upstream = httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "record":
+            return self._record(request)
+        return self._replay(request)
+
+    # ---------- RECORD ----------
+
+    def _record(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        # Ask for an uncompressed body so fixtures stay readable.
+        request.headers["accept-encoding"] = "identity"
+
+        started = time.perf_counter()
+        response = self._upstream.handle_request(request)
+        headers_at = round(time.perf_counter() - started, 4)
+
+        def save(body: bytes, chunks: list):
+            # Never let a recording problem fail a call that succeeded upstream.
+            try:
+                write_fixture(body, chunks)
+            except Exception as e:
+                warnings.warn(f"Could not record LLM fixture {key}: {e}")
+
+        def write_fixture(body: bytes, chunks: list):
+            fixture = {
+                "request": {
+                    "method": request.method,
+                    "path": request.url.path,
+                    "body": _decode_json(request.read()),
+                },
+                "response": {
+                    "status": response.status_code,
+                    "headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS},
+                    "headers_at": headers_at,
+                    "chunks": chunks,
+                    **_encode_body(body),
+                },
+            }
+            path = self.fixtures_dir / f"{key}.json"
+            path.write_text(json.dumps(fixture, ensure_ascii=False, indent=1), encoding="utf-8")
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, started, save),
+            extensions=response.extensions,
+        )
+
+    # ---------- REPLAY ----------
+
+    def _replay(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        path = self.fixtures_dir / f"{request_key(request)}.json"
+        if not path.is_file():
+            path = self._fallback(request, path)
+        fixture = json.loads(path.read_text(encoding="utf-8"))["response"]
+
+        delay = fixture["headers_at"] / self.speed
+        if delay > 0:
+            time.sleep(delay)
+
+        body = _decode_body(fixture)
+        return httpx.Response(
+            status_code=fixture["status"],
+            headers=fixture["headers"],
+            stream=_ReplayStream(body, fixture["chunks"], started, self.speed),
+        )
+
+    def _fallback(self, request: httpx.Request, missing: Path) -> Path:
+        if self.strict:
+            raise FileNotFoundError(
+                f"No recorded fixture for {request.method} {request.url.path} ({missing}). "
+                "Record it first with SHWIFT_LLM_MODE=record, or set SHWIFT_LLM_REPLAY_STRICT=0."
+            )
+        family = request_family(_decode_json(request.read()))
+        candidates = []
+        for path in sorted(self.fixtures_dir.glob("*.json")):
+            recorded = json.loads(path.read_text(encoding="utf-8"))["request"]
+            if (
+                recorded["method"] == request.method
+                and recorded["path"] == request.url.path
+                and request_family(recorded["body"]) == family
+            ):
+                candidates.append(path)
+        if not candidates:
+            raise FileNotFoundError(
+                f"No recorded fixtures for {request.method} {request.url.path} "
+                f"matching this prompt in {self.fixtures_dir}"
+            )
+        with self._lock:
+            index = self._fallback_index.get(family, 0)
+            self._fallback_index[family] = index + 1
+        return candidates[index % len(candidates)]
+
+
+def _decode_json(body: bytes):
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body.decode("utf-8", errors="replace")
+
+
+def _encode_body(body: bytes) -> dict:
+    # Text bodies stay readable; anything else (e.g. gzip) is kept as base64.
+    try:
+        return {"body": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(body).decode("ascii")}
+
+
+def _decode_body(fixture: dict) -> bytes:
+    if "body_b64" in fixture:
+        return base64.b64decode(fixture["body_b64"])
+    return fixture["body"].encode("utf-8")
+
+
+def get_mode() -> str:
+    mode = os.getenv("SHWIFT_LLM_MODE", "live").lower()
+    if mode not in MODES:
+        raise ValueError(f"SHWIFT_LLM_MODE must be one of {', '.join(MODES)}, got {mode!r}")
+    return mode
+
+
+def get_speed() -> float:
+    raw = os.getenv("SHWIFT_LLM_REPLAY_SPEED", "1")
+    try:
+        speed = float(raw)
+    except ValueError:
+        raise ValueError(f"SHWIFT_LLM_REPLAY_SPEED must be a number, got {raw!r}") from None
+    if speed <= 0:
+        raise ValueError(f"SHWIFT_LLM_REPLAY_SPEED must be positive, got {raw!r}")
+    return speed
+
+
+def build_http_client(mode: str):
+    """
+    Return an httpx client wired to the transport for `mode` (see get_mode),
+    or None in live mode so the OpenAI client keeps its own defaults.
+    """
+    if mode == "live":
+        return None
+
+    transport = RecordReplayTransport(
+        mode,
+        os.getenv("SHWIFT_LLM_FIXTURES", "llm_fixtures"),
+        speed=get_speed(),
+        strict=os.getenv("SHWIFT_LLM_REPLAY_STRICT", "1") != "0",
+    )
+    return httpx.Client(transport=transport)
@@ -0,0 +1,148 @@
+import json
+import time
+
+import httpx
+import pytest
+from openai import OpenAI
+
+from llm_transport import RecordReplayTransport, build_http_client, get_mode, get_speed
+
+
+def response_body(text: str) -> bytes:
+    return json.dumps({
+        "id": "resp_test",
+        "object": "response",
+        "created_at": 1760000000,
+        "status": "completed",
+        "model": "gpt-4.1-mini",
+        "output": [{
+            "type": "message",
+            "id": "msg_test",
+            "status": "completed",
+            "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+    }).encode("utf-8")
+
+
+class SlowStream(httpx.SyncByteStream):
+    def __init__(self, body: bytes, delay: float):
+        self.body = body
+        self.delay = delay
+
+    def __iter__(self):
+        half = len(self.body) // 2
+        time.sleep(self.delay / 2)
+        yield self.body[:half]
+        time.sleep(self.delay / 2)
+        yield self.body[half:]
+
+
+def stub_upstream(text_for_prompt, delay: float = 0.0):
+    def handler(request):
+        prompt = json.loads(request.read())["input"][-1]["content"]
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json"},
+            stream=SlowStream(response_body(text_for_prompt(prompt)), delay),
+        )
+    return httpx.MockTransport(handler)
+
+
+def make_client(transport) -> OpenAI:
+    return OpenAI(api_key="test", http_client=httpx.Client(transport=transport))
+
+
+def ask(client: OpenAI, prompt: str) -> str:
+    response = client.responses.create(
+        model="gpt-4.1-mini",
+        input=[
+            {"role": "system", "content": "You are SHWIFT, an AI engine for transformation."},
+            {"role": "user", "content": prompt},
+        ],
+    )
+    return response.output_text
+
+
+def record(fixtures_dir, prompts, text_for_prompt=lambda prompt: f"snapshot for {prompt}", delay=0.0):
+    transport = RecordReplayTransport(
+        "record", fixtures_dir, upstream=stub_upstream(text_for_prompt, delay)
+    )
+    client = make_client(transport)
+    return [ask(client, prompt) for prompt in prompts]
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    recorded = record(tmp_path, ["community\nanswers"])
+    assert recorded == ["snapshot for community\nanswers"]
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    replayed = ask(make_client(RecordReplayTransport("replay", tmp_path, speed=50)), "community\nanswers")
+    assert replayed == recorded[0]
+
+
+def test_replay_timing_is_scaled_by_speed(tmp_path):
+    record(tmp_path, ["community"], delay=0.2)
+    fixture = json.loads(next(tmp_path.glob("*.json")).read_text(encoding="utf-8"))
+    assert fixture["response"]["chunks"][-1][0] >= 0.2
+
+    client = make_client(RecordReplayTransport("replay", tmp_path, speed=10))
+    started = time.perf_counter()
+    ask(client, "community")
+    elapsed = time.perf_counter() - started
+    assert 0.02 <= elapsed < 0.15
+
+
+def test_strict_replay_miss_raises(tmp_path):
+    record(tmp_path, ["community"])
+    client = make_client(RecordReplayTransport("replay", tmp_path))
+    with pytest.raises(FileNotFoundError):
+        ask(client, "community, different answers")
+
+
+def test_non_strict_replay_cycles_within_the_same_prompt_family(tmp_path):
+    record(tmp_path, [
+        "You are SHWIFT — individuals\nanswers A",
+        "You are SHWIFT — individuals\nanswers B",
+        "You are SHWIFT — founders\nanswers C",
+    ])
+    client = make_client(RecordReplayTransport("replay", tmp_path, speed=50, strict=False))
+
+    community = {ask(client, "You are SHWIFT — individuals\nnew answers") for _ in range(2)}
+    assert community == {
+        "snapshot for You are SHWIFT — individuals\nanswers A",
+        "snapshot for You are SHWIFT — individuals\nanswers B",
+    }
+    assert ask(client, "You are SHWIFT — founders\nnew answers") == "snapshot for You are SHWIFT — founders\nanswers C"
+
+    with pytest.raises(FileNotFoundError):
+        ask(client, "You are SHWIFT — organisations\nnew answers")
+
+
+def test_record_survives_bodies_that_are_not_utf8(tmp_path):
+    body = b"\x1f\x8b\x08\x00not really gzip"
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "application/octet-stream"}, content=body)
+
+    transport = RecordReplayTransport("record", tmp_path, upstream=httpx.MockTransport(handler))
+    assert httpx.Client(transport=transport).post("https://api.openai.com/v1/responses", json={}).content == body
+
+    replay = RecordReplayTransport("replay", tmp_path, speed=50)
+    assert httpx.Client(transport=replay).post("https://api.openai.com/v1/responses", json={}).content == body
+
+
+def test_config_errors(monkeypatch):
+    monkeypatch.setenv("SHWIFT_LLM_MODE", "replya")
+    with pytest.raises(ValueError, match="SHWIFT_LLM_MODE"):
+        get_mode()
+
+    for speed in ("fast", "0"):
+        monkeypatch.setenv("SHWIFT_LLM_REPLAY_SPEED", speed)
+        with pytest.raises(ValueError, match="SHWIFT_LLM_REPLAY_SPEED"):
+            get_speed()
+
+    assert build_http_client("live") is None